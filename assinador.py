@@ -1,12 +1,14 @@
 
 import argparse
-import base64
+import binascii
 from crypto_lib import (
+    HASH_FUNCS,
     generate_rsa_keys,
     save_key_to_pem,
     load_key_from_pem,
-    sign_message,
-    verify_signature
+    hash_file,
+    sign_hash,
+    verify_hash
 )
 
 def main():
@@ -24,12 +26,14 @@ def main():
     parser_sign.add_argument("--priv", required=True, help="Arquivo da chave privada (private.pem).")
     parser_sign.add_argument("--arq", required=True, help="Arquivo a ser assinado.")
     parser_sign.add_argument("--sig", required=True, help="Arquivo de saída para a assinatura (ex: doc.sig).")
+    parser_sign.add_argument("--hash", choices=HASH_FUNCS, default="sha3_256", help="Função de hash (padrão: sha3_256).")
 
     # Comando para verificar uma assinatura
     parser_verify = subparsers.add_parser("verificar", help="Verifica a assinatura de um arquivo.")
     parser_verify.add_argument("--pub", required=True, help="Arquivo da chave pública (public.pem).")
     parser_verify.add_argument("--arq", required=True, help="Arquivo original que foi assinado.")
     parser_verify.add_argument("--sig", required=True, help="Arquivo da assinatura a ser verificada (doc.sig).")
+    parser_verify.add_argument("--hash", choices=HASH_FUNCS, default="sha3_256", help="Função de hash usada na assinatura (padrão: sha3_256).")
     
     args = parser.parse_args()
 
@@ -45,18 +49,17 @@ def main():
         private_key = load_key_from_pem(args.priv)
         
         try:
-            with open(args.arq, 'rb') as f:
-                message_bytes = f.read()
+            m_hash = hash_file(args.arq, HASH_FUNCS[args.hash])
         except FileNotFoundError:
             print(f"Erro: O arquivo '{args.arq}' não foi encontrado.")
             return
 
         print(f"Assinando o arquivo '{args.arq}'...")
-        signature_bytes = sign_message(message_bytes, private_key)
+        signature_bytes = sign_hash(m_hash, private_key, HASH_FUNCS[args.hash])
         
         # Salva a assinatura em Base64
-        with open(args.sig, 'w') as f:
-            f.write(base64.b64encode(signature_bytes).decode('ascii'))
+        with open(args.sig, 'wb') as f:
+            f.write(binascii.b2a_base64(signature_bytes, newline=False))
         
         print(f"Assinatura salva em '{args.sig}'.")
 
@@ -65,16 +68,14 @@ def main():
         public_key = load_key_from_pem(args.pub)
 
         try:
-            with open(args.arq, 'rb') as f:
-                message_bytes = f.read()
+            m_hash = hash_file(args.arq, HASH_FUNCS[args.hash])
         except FileNotFoundError:
             print(f"Erro: O arquivo original '{args.arq}' não foi encontrado.")
             return
             
         try:
-            with open(args.sig, 'r') as f:
-                signature_b64 = f.read()
-            signature_bytes = base64.b64decode(signature_b64)
+            with open(args.sig, 'rb') as f:
+                signature_bytes = binascii.a2b_base64(f.read())
         except FileNotFoundError:
             print(f"Erro: O arquivo de assinatura '{args.sig}' não foi encontrado.")
             return
@@ -83,7 +84,7 @@ def main():
              return
 
         print(f"Verificando a assinatura de '{args.arq}' com a assinatura '{args.sig}'...")
-        is_valid = verify_signature(message_bytes, signature_bytes, public_key)
+        is_valid = verify_hash(m_hash, signature_bytes, public_key, HASH_FUNCS[args.hash])
         
         if is_valid:
             print("\nResultado: ASSINATURA VÁLIDA.")
@@ -1,16 +1,66 @@
 
 import hashlib
+import hmac
 import os
 import base64
 import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+try:
+    from gmpy2 import mpz, powmod, is_prime as _gmpy_is_prime
+except ImportError: # gmpy2 é opcional; sem ele usamos os inteiros e o pow() nativos
+    mpz = int
+    powmod = pow
+    _gmpy_is_prime = None
 
 # --- Funções Aritméticas e de Primalidade ---
 
-def is_prime(n, k=40):
+# Para n abaixo deste limite, testar as bases 2, 3, 5, ..., 41 (os 13
+# primeiros primos) dá uma resposta determinística (Sorenson e Webster)
+DETERMINISTIC_MR_LIMIT = 3317044064679887385961981
+DETERMINISTIC_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+def _miller_rabin_rounds(bits):
+    """Número de rodadas aleatórias do Miller-Rabin conforme o tamanho de n."""
+    if bits < 512:
+        return 64
+    if bits < 1024:
+        return 56
+    if bits < 1536:
+        return 40
+    if bits < 2048:
+        return 28
+    return 4
+
+def _is_witness(a, r, s, n):
+    """Retorna True se a base a prova que n (n - 1 = 2^r * s) é composto."""
+    x = powmod(a, s, n)
+    if x == 1 or x == n - 1:
+        return False
+    
+    for _ in range(r - 1):
+        x = powmod(x, 2, n)
+        if x == n - 1:
+            return False
+    return True
+
+def _any_witness(bases, r, s, n):
+    """Retorna True se alguma das bases prova que n é composto, parando na primeira testemunha."""
+    return any(_is_witness(a, r, s, n) for a in bases)
+
+def is_prime(n, k=None):
     """
     Teste de primalidade de Miller-Rabin.
-    k é o número de rodadas de teste para garantir a acurácia.
+    k é o número de rodadas de teste para garantir a acurácia; se não for
+    informado, é escolhido pelo tamanho de n. Para n pequeno o teste usa
+    um conjunto fixo de bases e a resposta é exata. Com o gmpy2 o teste
+    é delegado ao GMP (divisão por primos pequenos, BPSW e Miller-Rabin).
     """
+    if _gmpy_is_prime is not None:
+        return bool(_gmpy_is_prime(n, k or _miller_rabin_rounds(n.bit_length())))
+
     if n < 2:
         return False
     if n == 2 or n == 3:
@@ -23,56 +73,150 @@ def is_prime(n, k=40):
         r += 1
         s //= 2
 
-    for _ in range(k):
-        a = os.urandom(16) # Pega um número aleatório
-        a = int.from_bytes(a, 'big') % (n - 3) + 2 # Garante a no intervalo [2, n-2]
+    if n < DETERMINISTIC_MR_LIMIT:
+        return not _any_witness([a for a in DETERMINISTIC_MR_BASES if a < n], r, s, n)
 
-        x = pow(a, s, n)
-        if x == 1 or x == n - 1:
-            continue
-        
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+    if k is None:
+        k = _miller_rabin_rounds(n.bit_length())
+
+    # Sorteia os bytes de todas as bases numa única chamada ao sistema
+    random_bytes = os.urandom(16 * k)
+    bases = [
+        int.from_bytes(random_bytes[16 * i:16 * (i + 1)], 'big') % (n - 3) + 2 # Garante a no intervalo [2, n-2]
+        for i in range(k)
+    ]
+    return not _any_witness(bases, r, s, n)
+
+def _small_primes(limit):
+    """Crivo de Eratóstenes: primos ímpares menores que limit."""
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(3, limit) if sieve[i]]
+
+# Primos pequenos usados para descartar candidatos antes do Miller-Rabin
+SMALL_PRIMES = _small_primes(1000)
 
 def generate_prime(bits):
-    """Gera um número primo com a quantidade de bits especificada."""
+    """
+    Gera um número primo com a quantidade de bits especificada.
+    A partir de um ímpar aleatório, percorre os candidatos de 2 em 2 e
+    só chama o Miller-Rabin para os que não são divisíveis por nenhum
+    primo pequeno. Os restos são calculados uma única vez por ponto de
+    partida, então o crivo não faz divisões com o inteiro grande.
+    """
+    # Com poucos bits o próprio candidato pode ser um dos primos pequenos
+    small_primes = SMALL_PRIMES if bits > 10 else []
     while True:
         # Gera um número ímpar aleatório com o número correto de bits
-        p = int.from_bytes(os.urandom(bits // 8), 'big')
+        p = mpz(int.from_bytes(os.urandom(bits // 8), 'big'))
         p |= (1 << (bits - 1)) | 1 # Garante que tenha 'bits' e seja ímpar
         
-        if is_prime(p):
-            return p
-
-def extended_gcd(a, b):
-    """Algoritmo Estendido de Euclides."""
-    if a == 0:
-        return b, 0, 1
-    d, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return d, x, y
+        residues = [int(p % sp) for sp in small_primes] # Restos como int, mesmo com p mpz
+        delta = 0
+        while (p + delta).bit_length() == bits:
+            if all((r + delta) % sp for r, sp in zip(residues, small_primes)):
+                if is_prime(p + delta):
+                    return int(p + delta)
+            delta += 2
 
 def mod_inverse(e, m):
-    """Calcula o inverso modular de e (mod m)."""
-    d, x, y = extended_gcd(e, m)
-    if d != 1:
-        raise ValueError("O inverso modular não existe")
-    return x % m
+    """
+    Calcula o inverso modular de e (mod m).
+    Usa o pow(e, -1, m) nativo (Python 3.8+), que resolve o Euclides
+    estendido em C sem recursão.
+    """
+    try:
+        return pow(e, -1, m)
+    except ValueError:
+        raise ValueError("O inverso modular não existe") from None
+
+def montgomery_exp(x, e, n):
+    """
+    Exponenciação modular x^e mod n para a operação privada do RSA.
+    Com o gmpy2 usa o powmod do GMP (redução de Montgomery e janelas
+    deslizantes em assembly); sem ele recorre ao pow() nativo, que já
+    implementa exponenciação por janelas em C.
+    Os operandos devem já estar convertidos com mpz() (como os campos
+    *_mpz de RSAKey); o resultado também é um mpz.
+    """
+    return powmod(x, e, n)
 
 # --- Geração e Serialização de Chaves RSA ---
 
+@dataclass
+class RSAKey:
+    """
+    Chave RSA: exponent é e (chave pública) ou d (chave privada).
+    Chaves privadas geradas por generate_rsa_keys trazem também os
+    parâmetros do CRT (p, q, dp, dq, qinv). Os valores derivados do
+    módulo são calculados uma única vez e reaproveitados em todas as
+    assinaturas e verificações feitas com a chave.
+    """
+    exponent: int
+    n: int
+    p: Optional[int] = None
+    q: Optional[int] = None
+    dp: Optional[int] = None
+    dq: Optional[int] = None
+    qinv: Optional[int] = None
+    bit_len: int = field(init=False, repr=False)
+    byte_len: int = field(init=False, repr=False)
+    em_len: int = field(init=False, repr=False)
+    exponent_mpz: object = field(init=False, repr=False)
+    n_mpz: object = field(init=False, repr=False)
+    crt_mpz: tuple = field(init=False, repr=False)
+    _pss_codecs: dict = field(init=False, repr=False, compare=False, default_factory=dict)
+
+    def __post_init__(self):
+        self.bit_len = self.n.bit_length()
+        # Tamanho da assinatura e da mensagem codificada pelo PSS, em bytes
+        self.byte_len = (self.bit_len + 7) // 8
+        self.em_len = (self.bit_len - 1 + 7) // 8
+        # Operandos já convertidos para o tipo do powmod (mpz com o gmpy2)
+        self.exponent_mpz = mpz(self.exponent)
+        self.n_mpz = mpz(self.n)
+        if self.p is None:
+            self.crt_mpz = None
+        else:
+            self.crt_mpz = tuple(mpz(v) for v in (self.p, self.q, self.dp, self.dq, self.qinv))
+
+    def pss_codec(self, hash_func=None):
+        """
+        Par (encode, verify) do PSS especializado para o tamanho desta
+        chave e para hash_func (padrão: HASH_FUNC), criado no primeiro uso.
+        O salt tem o tamanho do digest de hash_func.
+        """
+        if hash_func is None:
+            hash_func = HASH_FUNC
+        codec = self._pss_codecs.get(hash_func)
+        if codec is None:
+            codec = make_pss_codec(self.bit_len, hash_func)
+            self._pss_codecs[hash_func] = codec
+        return codec
+
+    def fields(self):
+        """Valores que são gravados no arquivo PEM, na ordem do arquivo."""
+        if self.p is None:
+            return (self.exponent, self.n)
+        return (self.exponent, self.n, self.p, self.q, self.dp, self.dq, self.qinv)
+
 def generate_rsa_keys(bits=2048):
     """
     Gera um par de chaves RSA (pública e privada).
+    Com mais de um processador, p e q são gerados em paralelo em
+    processos separados (o Miller-Rabin em Python puro fica preso ao GIL).
     """
-    p = generate_prime(bits // 2)
-    q = generate_prime(bits // 2)
+    if (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            future_p = executor.submit(generate_prime, bits // 2)
+            future_q = executor.submit(generate_prime, bits // 2)
+            p, q = future_p.result(), future_q.result()
+    else:
+        p = generate_prime(bits // 2)
+        q = generate_prime(bits // 2)
     while p == q:
         q = generate_prime(bits // 2)
 
@@ -84,19 +228,31 @@ def generate_rsa_keys(bits=2048):
 
     d = mod_inverse(e, lambda_n)
 
-    # public_key = (e, n), private_key = (d, n)
-    return ((e, n), (d, n))
+    # Parâmetros do Teorema Chinês do Resto para acelerar a assinatura
+    dp = d % (p - 1)
+    dq = d % (q - 1)
+    qinv = mod_inverse(q, p)
 
-def save_key_to_pem(key_data, filename, key_type):
-    """Salva a chave em um formato similar ao PEM."""
-    e_or_d, n = key_data
-    
-    e_or_d_b64 = base64.b64encode(e_or_d.to_bytes((e_or_d.bit_length() + 7) // 8, 'big')).decode('ascii')
-    n_b64 = base64.b64encode(n.to_bytes((n.bit_length() + 7) // 8, 'big')).decode('ascii')
+    # public_key = (e, n), private_key = (d, n, p, q, dp, dq, qinv)
+    return (RSAKey(e, n), RSAKey(d, n, p, q, dp, dq, qinv))
+
+def save_key_to_pem(key, filename, key_type):
+    """
+    Salva a chave em um formato similar ao PEM.
+    Os campos (e ou d, n e, na chave privada, os parâmetros do CRT)
+    são salvos em Base64 separados por ':'.
+    """
+    fields_b64 = [
+        base64.b64encode(value.to_bytes((value.bit_length() + 7) // 8, 'big')).decode('ascii')
+        for value in key.fields()
+    ]
     
-    pem_content = f"-----BEGIN RSA {key_type.upper()} KEY-----\n"
-    pem_content += f"{e_or_d_b64}:{n_b64}\n"
-    pem_content += f"-----END RSA {key_type.upper()} KEY-----"
+    key_type = key_type.upper()
+    pem_content = (
+        f"-----BEGIN RSA {key_type} KEY-----\n"
+        f"{':'.join(fields_b64)}\n"
+        f"-----END RSA {key_type} KEY-----\n"
+    )
     
     with open(filename, 'w') as f:
         f.write(pem_content)
@@ -108,132 +264,223 @@ def load_key_from_pem(filename):
         
     # Remove os cabeçalhos e rodapés
     base64_data = lines[1].strip()
-    e_or_d_b64, n_b64 = base64_data.split(':')
-    
-    e_or_d = int.from_bytes(base64.b64decode(e_or_d_b64), 'big')
-    n = int.from_bytes(base64.b64decode(n_b64), 'big')
     
-    return (e_or_d, n)
+    # Chaves antigas têm apenas (e ou d, n); chaves privadas novas trazem também os parâmetros do CRT
+    return RSAKey(*(int.from_bytes(base64.b64decode(field_b64), 'big') for field_b64 in base64_data.split(':')))
 
 
 # --- Funções de Hash e PSS ---
 
-HASH_FUNC = hashlib.sha3_256
-SALT_LEN = HASH_FUNC().digest_size
+_HLEN_CACHE = {}
+
+def _hlen(hash_func):
+    """Tamanho do digest de hash_func, calculado uma única vez por função de hash."""
+    h_len = _HLEN_CACHE.get(hash_func)
+    if h_len is None:
+        h_len = hash_func().digest_size
+        _HLEN_CACHE[hash_func] = h_len
+    return h_len
+
+# Funções de hash disponíveis. O SHA-256 costuma ser bem mais rápido que o
+# SHA3-256 em CPUs com as instruções SHA-NI, que o OpenSSL usa automaticamente.
+HASH_FUNCS = {
+    'sha3_256': hashlib.sha3_256,
+    'sha256': hashlib.sha256,
+}
+
+HASH_FUNC = HASH_FUNCS['sha3_256']
+SALT_LEN = _hlen(HASH_FUNC)
+FILE_CHUNK_SIZE = 1 << 20 # Lê os arquivos em blocos de 1 MiB
+
+def hash_file(filename, hash_func=HASH_FUNC, chunk_size=FILE_CHUNK_SIZE):
+    """
+    Calcula o hash de um arquivo lendo-o em blocos, sem carregá-lo
+    inteiro na memória.
+    """
+    h = hash_func()
+    with open(filename, 'rb', buffering=0) as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.digest()
 
 def mgf1(seed, mask_len, hash_func=HASH_FUNC):
-    """Mask Generation Function 1."""
-    h_len = hash_func().digest_size
+    """
+    Mask Generation Function 1.
+    A semente é absorvida uma única vez e o estado do hash é copiado para
+    cada contador; os blocos são escritos num buffer pré-alocado.
+    """
+    h_len = _hlen(hash_func)
     if mask_len > (2**32) * h_len:
         raise ValueError("Máscara muito longa")
     
-    T = b""
-    for i in range(math.ceil(mask_len / h_len)):
-        C = i.to_bytes(4, 'big')
-        T += hash_func(seed + C).digest()
+    h_seed = hash_func(seed)
+    n_blocks = -(-mask_len // h_len)
+    T = bytearray(n_blocks * h_len)
+    for i in range(n_blocks):
+        h = h_seed.copy()
+        h.update(i.to_bytes(4, 'big'))
+        T[i * h_len:(i + 1) * h_len] = h.digest()
         
-    return T[:mask_len]
+    return bytes(T[:mask_len])
 
-def pss_encode(message, key_bits, salt_len=SALT_LEN, hash_func=HASH_FUNC):
+def _xor_bytes(a, b):
+    """XOR de duas sequências de bytes de mesmo tamanho, feito como um único XOR de inteiros."""
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+def make_pss_codec(key_bits, hash_func=HASH_FUNC, salt_len=None):
     """
-    Implementa o padding PSS (codificação) para uma assinatura.
-    RFC 8017, Seção 9.1.1.
+    Cria as funções de codificação e verificação PSS (RFC 8017, Seções
+    9.1.1 e 9.1.2) para um tamanho de chave fixo.
+    Os tamanhos e constantes que dependem só de key_bits são calculados
+    aqui uma única vez; retorna (encode, verify), que recebem o hash da
+    mensagem já calculado. Se salt_len não for informado, o salt tem o
+    tamanho do digest de hash_func.
     """
-    m_hash = hash_func(message).digest()
-    h_len = len(m_hash)
-    em_len = math.ceil((key_bits - 1) / 8)
+    h_len = _hlen(hash_func)
+    if salt_len is None:
+        salt_len = h_len
+    em_len = (key_bits - 1 + 7) // 8
 
     if em_len < h_len + salt_len + 2:
-        raise ValueError("Erro de codificação: mensagem muito longa")
+        def encode(m_hash):
+            raise ValueError("Erro de codificação: mensagem muito longa")
 
-    salt = os.urandom(salt_len)
-    
-    M_prime = b'\x00' * 8 + m_hash + salt
-    H = hash_func(M_prime).digest()
-    
-    PS = b'\x00' * (em_len - salt_len - h_len - 2)
-    DB = PS + b'\x01' + salt
-    
-    db_mask = mgf1(H, em_len - h_len - 1, hash_func)
-    
-    masked_db = bytes(a ^ b for a, b in zip(DB, db_mask))
-    
-    # Zera os bits não utilizados no primeiro byte
-    mask = 0xFF >> (8 * em_len - (key_bits - 1))
-    masked_db = bytes([masked_db[0] & mask]) + masked_db[1:]
-    
-    EM = masked_db + H + b'\xbc'
-    return EM
+        def verify(m_hash, encoded_message):
+            return False # Consistência da verificação
 
-def pss_verify(message, encoded_message, key_bits, salt_len=SALT_LEN, hash_func=HASH_FUNC):
+        return encode, verify
 
-    m_hash = hash_func(message).digest()
-    h_len = len(m_hash)
-    em_len = math.ceil((key_bits - 1) / 8)
+    db_len = em_len - h_len - 1
+    ps_len = em_len - h_len - salt_len - 2
+    unused_bits = 8 * em_len - (key_bits - 1)
+    # Máscara que zera os bits não utilizados no primeiro byte
+    first_byte_mask = 0xFF >> unused_bits
 
-    if em_len < h_len + salt_len + 2:
-        return False # Consistência da verificação
+    def encode(m_hash, hash_func=hash_func, salt_len=salt_len, db_len=db_len,
+               first_byte_mask=first_byte_mask, ps_01=b'\x00' * ps_len + b'\x01', null8=b'\x00' * 8):
+        salt = os.urandom(salt_len)
+        
+        # H = Hash(M'), com M' = 00...00 || mHash || salt absorvido por partes, sem montar M'
+        h = hash_func(null8)
+        h.update(m_hash)
+        h.update(salt)
+        H = h.digest()
+        
+        DB = ps_01 + salt
+        
+        db_mask = mgf1(H, db_len, hash_func)
+        
+        masked_db = _xor_bytes(DB, db_mask)
+        
+        # Zera os bits não utilizados no primeiro byte
+        masked_db = bytes([masked_db[0] & first_byte_mask]) + masked_db[1:]
+        
+        EM = masked_db + H + b'\xbc'
+        return EM
 
-    if encoded_message[-1] != 0xbc:
-        return False # Trailer incorreto
+    def verify(m_hash, encoded_message, hash_func=hash_func, em_len=em_len, db_len=db_len, ps_len=ps_len,
+               unused_bits=unused_bits, first_byte_mask=first_byte_mask, null8=b'\x00' * 8):
+        if len(encoded_message) != em_len:
+            return False # Tamanho incorreto
 
-    masked_db = encoded_message[:em_len - h_len - 1]
-    H = encoded_message[em_len - h_len - 1:-1]
+        if encoded_message[-1] != 0xbc:
+            return False # Trailer incorreto
 
-    # Verifica os bits não utilizados
-    if (masked_db[0] >> (8 - (8 * em_len - (key_bits - 1)))) != 0:
-        return False
+        masked_db = encoded_message[:db_len]
+        H = encoded_message[db_len:-1]
+
+        # Verifica os bits não utilizados
+        if (masked_db[0] >> (8 - unused_bits)) != 0:
+            return False
+            
+        db_mask = mgf1(H, db_len, hash_func)
+        DB = _xor_bytes(masked_db, db_mask)
+
+        # Zera novamente os bits não utilizados no DB recuperado
+        DB = bytes([DB[0] & first_byte_mask]) + DB[1:]
+
+        # Parse DB
+        if int.from_bytes(DB[:ps_len], 'big') != 0:
+            return False
         
-    db_mask = mgf1(H, em_len - h_len - 1, hash_func)
-    DB = bytes(a ^ b for a, b in zip(masked_db, db_mask))
+        if DB[ps_len] != 0x01:
+            return False
 
-    # Zera novamente os bits não utilizados no DB recuperado
-    mask = 0xFF >> (8 * em_len - (key_bits - 1))
-    DB = bytes([DB[0] & mask]) + DB[1:]
+        salt = DB[ps_len + 1:]
+        
+        h = hash_func(null8)
+        h.update(m_hash)
+        h.update(salt)
+        H_prime = h.digest()
 
-    # Parse DB
-    ps_len = em_len - h_len - salt_len - 2
-    if not DB[:ps_len] == b'\x00' * ps_len:
-        return False
-    
-    if DB[ps_len] != 0x01:
-        return False
+        # Comparação em tempo constante
+        return hmac.compare_digest(H, H_prime)
 
-    salt = DB[ps_len + 1:]
-    
-    M_prime = b'\x00' * 8 + m_hash + salt
-    H_prime = hash_func(M_prime).digest()
+    return encode, verify
+
+def pss_encode(message, key_bits, salt_len=None, hash_func=HASH_FUNC):
+    """
+    Implementa o padding PSS (codificação) para uma assinatura.
+    RFC 8017, Seção 9.1.1.
+    """
+    return pss_encode_from_hash(hash_func(message).digest(), key_bits, salt_len, hash_func)
+
+def pss_encode_from_hash(m_hash, key_bits, salt_len=None, hash_func=HASH_FUNC):
+    """Codificação PSS a partir do hash da mensagem já calculado."""
+    encode, _ = make_pss_codec(key_bits, hash_func, salt_len)
+    return encode(m_hash)
 
-    return H == H_prime
+def pss_verify(message, encoded_message, key_bits, salt_len=None, hash_func=HASH_FUNC):
+    """Verificação PSS. RFC 8017, Seção 9.1.2."""
+    return pss_verify_from_hash(hash_func(message).digest(), encoded_message, key_bits, salt_len, hash_func)
+
+def pss_verify_from_hash(m_hash, encoded_message, key_bits, salt_len=None, hash_func=HASH_FUNC):
+    """Verificação PSS a partir do hash da mensagem já calculado."""
+    _, verify = make_pss_codec(key_bits, hash_func, salt_len)
+    return verify(m_hash, encoded_message)
 
 
 # --- Funções de Assinatura e Verificação ---
 
-def sign_message(message_bytes, private_key):
+def sign_message(message_bytes, private_key, hash_func=HASH_FUNC):
     """Cria uma assinatura RSA-PSS para uma mensagem."""
-    d, n = private_key
-    key_bits = n.bit_length()
-    
-    encoded_message = pss_encode(message_bytes, key_bits)
-    em_int = int.from_bytes(encoded_message, 'big')
+    return sign_hash(hash_func(message_bytes).digest(), private_key, hash_func)
+
+def sign_hash(m_hash, private_key, hash_func=HASH_FUNC):
+    """
+    Cria uma assinatura RSA-PSS a partir do hash da mensagem (ex: o
+    retornado por hash_file), calculado com hash_func.
+    """
+    encode, _ = private_key.pss_codec(hash_func)
+    encoded_message = encode(m_hash)
+    em_int = mpz(int.from_bytes(encoded_message, 'big'))
     
     # Cifra com a chave privada (assinatura)
-    signature_int = pow(em_int, d, n)
+    if private_key.crt_mpz is not None:
+        # RSA-CRT: duas exponenciações com metade do tamanho e recombinação de Garner
+        p, q, dp, dq, qinv = private_key.crt_mpz
+        m1 = montgomery_exp(em_int, dp, p)
+        m2 = montgomery_exp(em_int, dq, q)
+        h = (qinv * (m1 - m2)) % p
+        signature_int = int(m2 + h * q)
+    else:
+        signature_int = int(montgomery_exp(em_int, private_key.exponent_mpz, private_key.n_mpz))
     
-    signature_bytes = signature_int.to_bytes((n.bit_length() + 7) // 8, 'big')
+    signature_bytes = signature_int.to_bytes(private_key.byte_len, 'big')
     return signature_bytes
 
-def verify_signature(message_bytes, signature_bytes, public_key):
+def verify_signature(message_bytes, signature_bytes, public_key, hash_func=HASH_FUNC):
     """Verifica uma assinatura RSA-PSS."""
-    e, n = public_key
-    key_bits = n.bit_length()
-    
-    signature_int = int.from_bytes(signature_bytes, 'big')
+    return verify_hash(hash_func(message_bytes).digest(), signature_bytes, public_key, hash_func)
+
+def verify_hash(m_hash, signature_bytes, public_key, hash_func=HASH_FUNC):
+    """Verifica uma assinatura RSA-PSS a partir do hash da mensagem, calculado com hash_func."""
+    signature_int = mpz(int.from_bytes(signature_bytes, 'big'))
     
     # Decifra com a chave pública
-    em_int = pow(signature_int, e, n)
+    em_int = int(powmod(signature_int, public_key.exponent_mpz, public_key.n_mpz))
     
-    em_len = math.ceil((key_bits - 1) / 8)
-    encoded_message = em_int.to_bytes(em_len, 'big')
+    encoded_message = em_int.to_bytes(public_key.em_len, 'big')
 
-    return pss_verify(message_bytes, encoded_message, key_bits)
\ No newline at end of file
+    _, verify = public_key.pss_codec(hash_func)
+    return verify(m_hash, encoded_message)
\ No newline at end of file